@@ -5,11 +5,13 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -22,15 +24,10 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    _client = AsyncIOMotorClient(database_url)
     db = _client[database_name]
 
-# Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
-    if db is None:
-        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-
+def _prepare_document(data: Union[BaseModel, dict]) -> dict:
     # Convert Pydantic model to dict if needed
     if isinstance(data, BaseModel):
         data_dict = data.model_dump()
@@ -39,17 +36,63 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
 
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
+    return data_dict
+
+# Helper functions for common database operations
+async def create_document(collection_name: str, data: Union[BaseModel, dict], ack: bool = True):
+    """Insert a single document with timestamp; ack=False returns without waiting for the server (w=0)"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    collection = db[collection_name]
+    if not ack:
+        collection = collection.with_options(write_concern=WriteConcern(w=0))
 
-    result = db[collection_name].insert_one(data_dict)
+    # The _id is generated client-side, so it is available even when unacknowledged
+    result = await collection.insert_one(_prepare_document(data))
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def create_documents(collection_name: str, items: List[Union[BaseModel, dict]]):
+    """Insert many documents with timestamps in one round-trip; returns (inserted ids, failed item indexes)"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    docs = [_prepare_document(d) for d in items]
+    failed = []
+    try:
+        await db[collection_name].insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: every document without a write error was still inserted
+        failed = sorted({err["index"] for err in e.details.get("writeErrors", [])})
+    failed_set = set(failed)
+    # insert_many assigns _id client-side before sending
+    inserted = [str(d["_id"]) for i, d in enumerate(docs) if i not in failed_set]
+    return inserted, failed
+
+def find_documents(
+    collection_name: str,
+    filter_dict: dict = None,
+    limit: int = None,
+    skip: int = 0,
+    projection: dict = None,
+    sort: list = None,
+    collation: dict = None,
+):
+    """Get a cursor over documents, optionally projected, sorted, paged and matched under a collation"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection, collation=collation)
+    if sort:
+        cursor = cursor.sort(sort)
+    if skip:
+        cursor = cursor.skip(skip)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return cursor
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, **kwargs):
+    """Get documents from collection as a list (see find_documents for options)"""
+    cursor = find_documents(collection_name, filter_dict, limit, **kwargs)
+    return await cursor.to_list(length=None)
@@ -1,20 +1,55 @@
 import os
+import re
+import hashlib
+import hmac
+import logging
 from typing import List, Optional, Any, Dict
-from fastapi import FastAPI, HTTPException, Query, Header, Depends, UploadFile, File
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Header, Depends, UploadFile, File, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from bson import ObjectId
-from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from datetime import date, datetime
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from uuid import uuid4
+import jinja2
+import orjson
 
-from database import db, create_document, get_documents
+from database import db, create_document, create_documents, find_documents
 from schemas import Trek, BlogPost, Inquiry, AdminUser
 
-app = FastAPI(title="Juma Trek API")
+logger = logging.getLogger(__name__)
+
+# Settings are read once at import (after database.py has loaded .env)
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+ADMIN_NOTIFY_EMAIL = os.getenv("ADMIN_NOTIFY_EMAIL")
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "0") or 0)
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASS = os.getenv("SMTP_PASS")
+SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER or "noreply@example.com")
+SMTP_CONFIGURED = bool(SMTP_HOST and SMTP_PORT and SMTP_USER and SMTP_PASS)
+# Seconds before a stalled SMTP connect/command raises; the pool lock is held meanwhile
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "15") or 15)
+
+# Mongo returns naive UTC datetimes; emit them as ISO-8601 with a Z suffix
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class APIJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+app = FastAPI(title="Juma Trek API", default_response_class=APIJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Trek/blog JSON compresses well; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Ensure uploads directory exists and mount static serving
 UPLOAD_ROOT = os.path.abspath("uploads")
 os.makedirs(UPLOAD_ROOT, exist_ok=True)
@@ -33,43 +71,131 @@ app.mount("/uploads", StaticFiles(directory=UPLOAD_ROOT), name="uploads")
 class IdResponse(BaseModel):
     id: str
 
+class IdsResponse(BaseModel):
+    ids: List[str]
+    failed: List[int] = []
+
 class AdminAuth(BaseModel):
     email: EmailStr
     password: str
 
 
+# Case-insensitive (strength 2) collation; queries must pass the same
+# collation as the index for the planner to use it
+CI_COLLATION = {"locale": "en", "strength": 2}
+
+
+# Upper bound on documents accepted by a single bulk create request
+BULK_MAX_ITEMS = 500
+
+# Stable order for paginated list endpoints (insertion order)
+PAGE_SORT = [("_id", 1)]
+
+# List endpoints drop heavy fields; the detail endpoints return full docs
+TREK_LIST_PROJECTION = {
+    "title": 1,
+    "slug": 1,
+    "region": 1,
+    "difficulty": 1,
+    "duration_days": 1,
+    "price_usd": 1,
+    "is_featured": 1,
+    "images": {"$slice": 1},
+}
+BLOG_LIST_PROJECTION = {"content": 0}
+
+
 def get_collection_name(model_cls) -> str:
     return model_cls.__name__.lower()
 
 
+_OID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
 def to_object_id(id_str: str) -> ObjectId:
-    try:
-        return ObjectId(id_str)
-    except Exception:
+    # Reject malformed ids up front instead of via ObjectId's exception path
+    if not _OID_RE.fullmatch(id_str):
         raise HTTPException(status_code=400, detail="Invalid id")
+    return ObjectId(id_str)
+
+
+def build_update(payload: BaseModel) -> Dict[str, Any]:
+    # Only fields the client sent (explicit nulls included, so they clear);
+    # BSON has no date type, so dates are stored as midnight datetimes
+    changes = payload.model_dump(exclude_unset=True)
+    for k, v in changes.items():
+        if isinstance(v, date) and not isinstance(v, datetime):
+            changes[k] = datetime(v.year, v.month, v.day)
+    return {"$set": {**changes, "updated_at": datetime.utcnow()}}
 
 
 def serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # Datetimes are left for orjson to encode (see ORJSON_OPTIONS)
     if not doc:
         return doc
     doc["id"] = str(doc.pop("_id"))
-    # Convert datetimes to isoformat
-    for k, v in list(doc.items()):
-        if isinstance(v, datetime):
-            doc[k] = v.isoformat()
     return doc
 
 
+async def stream_documents(first: Dict[str, Any], cursor):
+    # Emit a JSON array one document at a time as the cursor yields them
+    yield b"["
+    yield orjson.dumps(serialize_doc(first), option=ORJSON_OPTIONS)
+    async for doc in cursor:
+        yield b","
+        yield orjson.dumps(serialize_doc(doc), option=ORJSON_OPTIONS)
+    yield b"]"
+
+
+async def list_response(cursor) -> Response:
+    # Pull the first document before any headers go out, so query errors
+    # (e.g. a missing text index) raise through normal error handling
+    try:
+        first = await cursor.next()
+    except StopAsyncIteration:
+        return APIJSONResponse([])
+    return StreamingResponse(stream_documents(first, cursor), media_type="application/json")
+
+
 def require_admin(x_admin_key: Optional[str] = Header(None)):
-    expected = os.getenv("ADMIN_API_KEY")
-    if expected and x_admin_key == expected:
-        return True
-    if not expected:
+    if not ADMIN_API_KEY:
         # If no key set, allow all (dev mode)
         return True
+    if x_admin_key and hmac.compare_digest(x_admin_key.encode(), ADMIN_API_KEY.encode()):
+        return True
     raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+# Admin-only routes; the key check is declared once on the router
+admin_router = APIRouter(prefix="/api", dependencies=[Depends(require_admin)])
+
+
+# -------------------- Indexes --------------------
+# (collection, keys, extra create_index options)
+INDEX_SPECS = [
+    (get_collection_name(Trek), [("is_featured", 1), ("duration_days", 1)], {}),
+    (get_collection_name(Trek), [("difficulty", 1)], {"collation": CI_COLLATION}),
+    (get_collection_name(Trek), [("title", "text"), ("overview", "text"), ("highlights", "text")], {}),
+    (get_collection_name(BlogPost), [("tags", 1)], {"collation": CI_COLLATION}),
+    (get_collection_name(BlogPost), [("title", "text"), ("content", "text")], {}),
+    (get_collection_name(AdminUser), [("email", 1)], {"unique": True, "collation": CI_COLLATION}),
+]
+
+
+@app.on_event("startup")
+async def create_indexes():
+    if db is None:
+        return
+    for col_name, keys, options in INDEX_SPECS:
+        try:
+            await db[col_name].create_index(keys, **options)
+        except OperationFailure as e:
+            # An index with the same keys but different options already exists,
+            # or existing data violates a unique constraint; keep serving, but
+            # make the missing index visible
+            logger.warning("Could not create index %s on %s: %s", keys, col_name, e)
+
+
 # -------------------- Root & Health --------------------
 @app.get("/")
 def read_root():
@@ -77,7 +203,7 @@ def read_root():
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -93,7 +219,7 @@ def test_database():
             response["database_name"] = getattr(db, "name", "unknown")
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await db.list_collection_names()
                 response["collections"] = collections[:20]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -106,19 +232,42 @@ def test_database():
 
 
 # -------------------- Schema Endpoint --------------------
+# Model schemas never change at runtime; build and encode them once
+_SCHEMA_CACHE = {
+    "trek": Trek.model_json_schema(),
+    "blogpost": BlogPost.model_json_schema(),
+    "inquiry": Inquiry.model_json_schema(),
+    "adminuser": AdminUser.model_json_schema(),
+}
+_SCHEMA_BODY = orjson.dumps(_SCHEMA_CACHE)
+_SCHEMA_HEADERS = {
+    "ETag": f'"{hashlib.sha256(_SCHEMA_BODY).hexdigest()[:32]}"',
+    "Cache-Control": "public, max-age=3600",
+}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/ prefixes are ignored, and the
+    # header may be a comma-separated list or "*"
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @app.get("/schema")
-def get_schema_definitions():
-    return {
-        "trek": Trek.model_json_schema(),
-        "blogpost": BlogPost.model_json_schema(),
-        "inquiry": Inquiry.model_json_schema(),
-        "adminuser": AdminUser.model_json_schema(),
-    }
+def get_schema_definitions(if_none_match: Optional[str] = Header(None)):
+    if etag_matches(if_none_match, _SCHEMA_HEADERS["ETag"]):
+        return Response(status_code=304, headers=_SCHEMA_HEADERS)
+    return Response(content=_SCHEMA_BODY, media_type="application/json", headers=_SCHEMA_HEADERS)
 
 
 # -------------------- File Uploads --------------------
-@app.post("/api/upload")
-def upload_file(folder: Optional[str] = Query(default="misc"), file: UploadFile = File(...), _: bool = Depends(require_admin)):
+@admin_router.post("/upload")
+def upload_file(folder: Optional[str] = Query(default="misc"), file: UploadFile = File(...)):
     # Sanitize folder name to avoid path traversal
     safe_folder = "".join(ch for ch in (folder or "misc") if ch.isalnum() or ch in ("-", "_")) or "misc"
     target_dir = os.path.join(UPLOAD_ROOT, safe_folder)
@@ -142,19 +291,22 @@ def upload_file(folder: Optional[str] = Query(default="misc"), file: UploadFile
 
 # -------------------- Treks --------------------
 @app.get("/api/treks")
-def list_treks(
-    region: Optional[str] = None,
-    difficulty: Optional[str] = None,
+async def list_treks(
+    region: Optional[str] = Query(None, max_length=64),
+    difficulty: Optional[str] = Query(None, max_length=32),
     min_days: Optional[int] = Query(None, ge=1),
     max_days: Optional[int] = Query(None, ge=1),
-    search: Optional[str] = None,
+    search: Optional[str] = Query(None, max_length=128),
     featured: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
 ):
     filter_q: Dict[str, Any] = {}
     if region:
-        filter_q["region"] = {"$regex": region, "$options": "i"}
+        # Escaped and anchored: prefix match, no user-controlled regex syntax
+        filter_q["region"] = {"$regex": f"^{re.escape(region)}", "$options": "i"}
     if difficulty:
-        filter_q["difficulty"] = {"$regex": f"^{difficulty}$", "$options": "i"}
+        filter_q["difficulty"] = difficulty
     if min_days is not None or max_days is not None:
         dur_cond: Dict[str, Any] = {}
         if min_days is not None:
@@ -163,49 +315,64 @@ def list_treks(
             dur_cond["$lte"] = max_days
         filter_q["duration_days"] = dur_cond
     if search:
-        filter_q["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"overview": {"$regex": search, "$options": "i"}},
-            {"highlights": {"$elemMatch": {"$regex": search, "$options": "i"}}},
-        ]
+        filter_q["$text"] = {"$search": search}
     if featured is not None:
         filter_q["is_featured"] = featured
 
-    docs = get_documents(get_collection_name(Trek), filter_q)
-    return [serialize_doc(d) for d in docs]
+    cursor = find_documents(
+        get_collection_name(Trek),
+        filter_q,
+        limit=limit,
+        skip=offset,
+        projection=TREK_LIST_PROJECTION,
+        sort=PAGE_SORT,
+        collation=CI_COLLATION,
+    )
+    return await list_response(cursor)
 
 
 @app.get("/api/treks/{trek_id}")
-def get_trek(trek_id: str):
-    doc = db[get_collection_name(Trek)].find_one({"_id": to_object_id(trek_id)})
+async def get_trek(trek_id: str):
+    doc = await db[get_collection_name(Trek)].find_one({"_id": to_object_id(trek_id)})
     if not doc:
         raise HTTPException(status_code=404, detail="Trek not found")
-    return serialize_doc(doc)
+    return APIJSONResponse(serialize_doc(doc))
 
 
-@app.post("/api/treks", response_model=IdResponse)
-def create_trek(payload: Trek, _: bool = Depends(require_admin)):
-    new_id = create_document(get_collection_name(Trek), payload)
+@admin_router.post("/treks", response_model=IdResponse)
+async def create_trek(payload: Trek):
+    new_id = await create_document(get_collection_name(Trek), payload)
     return {"id": new_id}
 
 
-@app.put("/api/treks/{trek_id}")
-def update_trek(trek_id: str, payload: Trek, _: bool = Depends(require_admin)):
+@admin_router.post("/treks/bulk", response_model=IdsResponse)
+async def create_treks_bulk(payloads: List[Trek]):
+    if not payloads:
+        return {"ids": []}
+    if len(payloads) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} treks per request")
+    # failed lists the payload indexes Mongo rejected (e.g. duplicate keys)
+    new_ids, failed = await create_documents(get_collection_name(Trek), payloads)
+    return {"ids": new_ids, "failed": failed}
+
+
+@admin_router.put("/treks/{trek_id}")
+async def update_trek(trek_id: str, payload: Trek):
     col = db[get_collection_name(Trek)]
-    res = col.update_one(
+    doc = await col.find_one_and_update(
         {"_id": to_object_id(trek_id)},
-        {"$set": {**payload.model_dump(), "updated_at": datetime.utcnow()}},
+        build_update(payload),
+        return_document=ReturnDocument.AFTER,
     )
-    if res.matched_count == 0:
+    if doc is None:
         raise HTTPException(status_code=404, detail="Trek not found")
-    doc = col.find_one({"_id": to_object_id(trek_id)})
-    return serialize_doc(doc)
+    return APIJSONResponse(serialize_doc(doc))
 
 
-@app.delete("/api/treks/{trek_id}", response_model=IdResponse)
-def delete_trek(trek_id: str, _: bool = Depends(require_admin)):
+@admin_router.delete("/treks/{trek_id}", response_model=IdResponse)
+async def delete_trek(trek_id: str):
     col = db[get_collection_name(Trek)]
-    res = col.delete_one({"_id": to_object_id(trek_id)})
+    res = await col.delete_one({"_id": to_object_id(trek_id)})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Trek not found")
     return {"id": trek_id}
@@ -213,50 +380,60 @@ def delete_trek(trek_id: str, _: bool = Depends(require_admin)):
 
 # -------------------- Blog Posts --------------------
 @app.get("/api/blog-posts")
-def list_blog_posts(tag: Optional[str] = None, search: Optional[str] = None):
+async def list_blog_posts(
+    tag: Optional[str] = Query(None, max_length=64),
+    search: Optional[str] = Query(None, max_length=128),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
     filter_q: Dict[str, Any] = {}
     if tag:
-        filter_q["tags"] = {"$elemMatch": {"$regex": tag, "$options": "i"}}
+        filter_q["tags"] = tag
     if search:
-        filter_q["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"content": {"$regex": search, "$options": "i"}},
-        ]
-    docs = get_documents(get_collection_name(BlogPost), filter_q)
-    return [serialize_doc(d) for d in docs]
+        filter_q["$text"] = {"$search": search}
+    cursor = find_documents(
+        get_collection_name(BlogPost),
+        filter_q,
+        limit=limit,
+        skip=offset,
+        projection=BLOG_LIST_PROJECTION,
+        sort=PAGE_SORT,
+        collation=CI_COLLATION,
+    )
+    return await list_response(cursor)
 
 
 @app.get("/api/blog-posts/{post_id}")
-def get_blog_post(post_id: str):
-    doc = db[get_collection_name(BlogPost)].find_one({"_id": to_object_id(post_id)})
+async def get_blog_post(post_id: str):
+    doc = await db[get_collection_name(BlogPost)].find_one({"_id": to_object_id(post_id)})
     if not doc:
         raise HTTPException(status_code=404, detail="Post not found")
-    return serialize_doc(doc)
+    return APIJSONResponse(serialize_doc(doc))
 
 
-@app.post("/api/blog-posts", response_model=IdResponse)
-def create_blog_post(payload: BlogPost, _: bool = Depends(require_admin)):
-    new_id = create_document(get_collection_name(BlogPost), payload)
+@admin_router.post("/blog-posts", response_model=IdResponse)
+async def create_blog_post(payload: BlogPost):
+    new_id = await create_document(get_collection_name(BlogPost), payload)
     return {"id": new_id}
 
 
-@app.put("/api/blog-posts/{post_id}")
-def update_blog_post(post_id: str, payload: BlogPost, _: bool = Depends(require_admin)):
+@admin_router.put("/blog-posts/{post_id}")
+async def update_blog_post(post_id: str, payload: BlogPost):
     col = db[get_collection_name(BlogPost)]
-    res = col.update_one(
+    doc = await col.find_one_and_update(
         {"_id": to_object_id(post_id)},
-        {"$set": {**payload.model_dump(), "updated_at": datetime.utcnow()}},
+        build_update(payload),
+        return_document=ReturnDocument.AFTER,
     )
-    if res.matched_count == 0:
+    if doc is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    doc = col.find_one({"_id": to_object_id(post_id)})
-    return serialize_doc(doc)
+    return APIJSONResponse(serialize_doc(doc))
 
 
-@app.delete("/api/blog-posts/{post_id}", response_model=IdResponse)
-def delete_blog_post(post_id: str, _: bool = Depends(require_admin)):
+@admin_router.delete("/blog-posts/{post_id}", response_model=IdResponse)
+async def delete_blog_post(post_id: str):
     col = db[get_collection_name(BlogPost)]
-    res = col.delete_one({"_id": to_object_id(post_id)})
+    res = await col.delete_one({"_id": to_object_id(post_id)})
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Post not found")
     return {"id": post_id}
@@ -268,119 +445,238 @@ class InquiryResponse(BaseModel):
     id: Optional[str] = None
 
 
-def try_send_email(subject: str, body_html: str, to_email: str) -> bool:
-    host = os.getenv("SMTP_HOST")
-    port = int(os.getenv("SMTP_PORT", "0") or 0)
-    user = os.getenv("SMTP_USER")
-    pwd = os.getenv("SMTP_PASS")
-    from_email = os.getenv("SMTP_FROM", user or "noreply@example.com")
-    if not (host and port and user and pwd):
-        return False
+class SMTPPool:
+    """A single lazily-opened SMTP_SSL session per worker process, reused across emails.
+
+    The session is probed with NOOP before each use and reopened when the
+    server has dropped it, so the TLS handshake and AUTH are only paid once
+    per connection rather than once per email.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._server: Optional[smtplib.SMTP_SSL] = None
+
+    def _close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            finally:
+                # quit() skips closing the socket if the QUIT command fails
+                self._server.close()
+        self._server = None
+
+    def _is_alive(self) -> bool:
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _connection(self) -> smtplib.SMTP_SSL:
+        if self._server is not None and not self._is_alive():
+            self._close()
+        if self._server is None:
+            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+            try:
+                server.login(SMTP_USER, SMTP_PASS)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+
+    def _send(self, to_email: str, msg: str):
+        try:
+            self._connection().sendmail(SMTP_FROM, [to_email], msg)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between the NOOP probe and the send; retry once on a fresh session
+            self._close()
+            try:
+                self._connection().sendmail(SMTP_FROM, [to_email], msg)
+            except Exception:
+                self._close()
+                raise
+        except Exception:
+            self._close()
+            raise
+
+    def sendmail(self, messages: List[tuple]) -> int:
+        """Send (to_email, msg) pairs over one session; returns how many were accepted"""
+        sent = 0
+        with self._lock:
+            for to_email, msg in messages:
+                try:
+                    self._send(to_email, msg)
+                    sent += 1
+                except Exception:
+                    continue
+        return sent
+
+
+smtp_pool = SMTPPool()
+
+
+def build_email(subject: str, body_html: str, from_email: str, to_email: str) -> str:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = from_email
+    msg["To"] = to_email
+    msg.attach(MIMEText(body_html, "html"))
+    return msg.as_string()
+
+
+def send_many(msgs: List[tuple]) -> int:
+    """Send (subject, body_html, to_email) messages in one SMTP session; returns how many were sent"""
+    if not SMTP_CONFIGURED:
+        return 0
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        msg.attach(MIMEText(body_html, "html"))
-        with smtplib.SMTP_SSL(host, port) as server:
-            server.login(user, pwd)
-            server.sendmail(from_email, [to_email], msg.as_string())
-        return True
+        messages = [(to_email, build_email(subject, body_html, SMTP_FROM, to_email)) for subject, body_html, to_email in msgs]
     except Exception:
-        return False
+        return 0
+    return smtp_pool.sendmail(messages)
+
+
+# Compiled once; autoescape keeps user-supplied fields from injecting HTML
+email_env = jinja2.Environment(autoescape=True)
+
+ADMIN_INQUIRY_TPL = email_env.from_string("""
+<h2>New Inquiry</h2>
+<p><b>Name:</b> {{ inquiry.name }}</p>
+<p><b>Email:</b> {{ inquiry.email }}</p>
+<p><b>Trek ID:</b> {{ inquiry.trek_id or '-' }}</p>
+<p><b>Travelers:</b> {{ inquiry.travelers or 1 }}</p>
+<p><b>Preferred Start:</b> {{ inquiry.preferred_start_date or '-' }}</p>
+<p><b>Message:</b><br/>{{ inquiry.message }}</p>
+""")
+
+CLIENT_INQUIRY_TPL = email_env.from_string("""
+<p>Hi {{ inquiry.name }},</p>
+<p>Thanks for reaching out to Juma Trek! Our team will get back to you shortly.</p>
+<p>Summary of your request:</p>
+<ul>
+  <li>Trek ID: {{ inquiry.trek_id or '-' }}</li>
+  <li>Travelers: {{ inquiry.travelers or 1 }}</li>
+  <li>Preferred Start: {{ inquiry.preferred_start_date or '-' }}</li>
+</ul>
+<p>— Juma Trek Team</p>
+""")
 
 
 @app.post("/api/inquiries", response_model=InquiryResponse)
-def create_inquiry(payload: Inquiry):
-    new_id = create_document(get_collection_name(Inquiry), payload)
-    # Send notification emails if SMTP configured
-    admin_email = os.getenv("ADMIN_NOTIFY_EMAIL")
-    client_ok = False
-    admin_ok = False
-    if admin_email:
-        admin_ok = try_send_email(
-            subject="New Trek Inquiry",
-            body_html=f"""
-            <h2>New Inquiry</h2>
-            <p><b>Name:</b> {payload.name}</p>
-            <p><b>Email:</b> {payload.email}</p>
-            <p><b>Trek ID:</b> {payload.trek_id or '-'}
-            <p><b>Travelers:</b> {payload.travelers or 1}</p>
-            <p><b>Preferred Start:</b> {payload.preferred_start_date or '-'}
-            <p><b>Message:</b><br/>{payload.message}</p>
-            """,
-            to_email=admin_email,
-        )
-    client_ok = try_send_email(
-        subject="We received your inquiry - Juma Trek",
-        body_html=f"""
-        <p>Hi {payload.name},</p>
-        <p>Thanks for reaching out to Juma Trek! Our team will get back to you shortly.</p>
-        <p>Summary of your request:</p>
-        <ul>
-          <li>Trek ID: {payload.trek_id or '-'}
-          <li>Travelers: {payload.travelers or 1}
-          <li>Preferred Start: {payload.preferred_start_date or '-'}
-        </ul>
-        <p>— Juma Trek Team</p>
-        """,
-        to_email=payload.email,
-    )
-    note = " Email notifications sent." if (client_ok or admin_ok) else " Email notifications skipped."
-    return {"message": "Inquiry submitted successfully." + note, "id": new_id}
-
-
-@app.get("/api/inquiries")
-def list_inquiries(_: bool = Depends(require_admin)):
-    docs = get_documents(get_collection_name(Inquiry), {})
-    return [serialize_doc(d) for d in docs]
+async def create_inquiry(payload: Inquiry, background: BackgroundTasks):
+    # Fire-and-forget insert: an occasional lost inquiry is acceptable here
+    new_id = await create_document(get_collection_name(Inquiry), payload, ack=False)
+    # Queue notification emails if SMTP configured; they are sent after the
+    # response is returned so the SMTP round-trips stay off the request path
+    if not SMTP_CONFIGURED:
+        return {"message": "Inquiry submitted successfully. Email notifications skipped.", "id": new_id}
+    msgs = []
+    if ADMIN_NOTIFY_EMAIL:
+        msgs.append(("New Trek Inquiry", ADMIN_INQUIRY_TPL.render(inquiry=payload), ADMIN_NOTIFY_EMAIL))
+    msgs.append(("We received your inquiry - Juma Trek", CLIENT_INQUIRY_TPL.render(inquiry=payload), payload.email))
+    # Both notifications go out in a single background task over one SMTP session
+    background.add_task(send_many, msgs)
+    return {"message": "Inquiry submitted successfully. Email notifications queued.", "id": new_id}
+
+
+@admin_router.get("/inquiries")
+async def list_inquiries(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    cursor = find_documents(get_collection_name(Inquiry), {}, limit=limit, skip=offset, sort=PAGE_SORT)
+    return await list_response(cursor)
 
 
 # -------------------- Admin Users (basic) --------------------
 import os as _os
-import hashlib
 import secrets
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+PW_ALG_ARGON2 = "argon2"
+# Users created before argon2 have no pw_alg and a salted PBKDF2 hash
+PW_ALG_PBKDF2 = "pbkdf2_sha256"
 
+password_hasher = PasswordHasher()
 
-def hash_password(password: str, salt: Optional[str] = None) -> (str, str):
+
+def hash_password(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def hash_password_pbkdf2(password: str, salt: Optional[str] = None) -> (str, str):
     salt = salt or secrets.token_hex(16)
     dk = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 100_000)
     return dk.hex(), salt
 
 
+def verify_password(password: str, user: Dict[str, Any]) -> bool:
+    stored_hash = user.get("password_hash") or ""
+    if user.get("pw_alg", PW_ALG_PBKDF2) == PW_ALG_ARGON2:
+        try:
+            return password_hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    calc_hash, _ = hash_password_pbkdf2(password, user.get("password_salt"))
+    return hmac.compare_digest(calc_hash, stored_hash)
+
+
+def password_needs_rehash(user: Dict[str, Any]) -> bool:
+    if user.get("pw_alg", PW_ALG_PBKDF2) != PW_ALG_ARGON2:
+        return True
+    return password_hasher.check_needs_rehash(user.get("password_hash") or "")
+
+
 class CreateAdmin(BaseModel):
     email: EmailStr
     password: str
     full_name: Optional[str] = None
 
 
-@app.post("/api/admin/users", response_model=IdResponse)
-def create_admin_user(payload: CreateAdmin, _: bool = Depends(require_admin)):
-    pw_hash, salt = hash_password(payload.password)
+@admin_router.post("/admin/users", response_model=IdResponse)
+async def create_admin_user(payload: CreateAdmin):
+    # Password hashing is CPU-bound; keep it off the event loop
+    pw_hash = await run_in_threadpool(hash_password, payload.password)
     admin_doc = AdminUser(
         email=payload.email,
         password_hash=pw_hash,
-        password_salt=salt,
+        pw_alg=PW_ALG_ARGON2,
         full_name=payload.full_name,
     )
-    new_id = create_document(get_collection_name(AdminUser), admin_doc)
+    try:
+        new_id = await create_document(get_collection_name(AdminUser), admin_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Admin user already exists")
     return {"id": new_id}
 
 
 @app.post("/api/admin/login")
-def admin_login(payload: AdminAuth):
+async def admin_login(payload: AdminAuth):
     col = db[get_collection_name(AdminUser)]
-    user = col.find_one({"email": payload.email})
+    user = await col.find_one({"email": payload.email}, collation=CI_COLLATION)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    calc_hash, _ = hash_password(payload.password, user.get("password_salt"))
-    if calc_hash != user.get("password_hash"):
+    if not await run_in_threadpool(verify_password, payload.password, user):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if password_needs_rehash(user):
+        # Transparently migrate legacy (or outdated-parameter) hashes to argon2
+        pw_hash = await run_in_threadpool(hash_password, payload.password)
+        await col.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"password_hash": pw_hash, "pw_alg": PW_ALG_ARGON2}, "$unset": {"password_salt": ""}},
+        )
     # For simplicity, return a static token if ADMIN_API_KEY is set
-    token = os.getenv("ADMIN_API_KEY") or "dev-admin"
+    token = ADMIN_API_KEY or "dev-admin"
     return {"token": token, "user": {"email": user.get("email"), "id": str(user.get("_id"))}}
 
 
+# Must run after every admin route above has been declared
+app.include_router(admin_router)
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
@@ -50,6 +50,7 @@ class Inquiry(BaseModel):
 class AdminUser(BaseModel):
     email: EmailStr
     password_hash: str
-    password_salt: str
+    password_salt: Optional[str] = Field(None, description="Salt for legacy pbkdf2_sha256 hashes")
+    pw_alg: str = Field(default="argon2", description="Password hash algorithm: argon2/pbkdf2_sha256")
     full_name: Optional[str] = None
     role: str = Field(default="admin")